@@ -1,21 +1,34 @@
-from flask import Flask, jsonify, render_template, request
+from flask import Flask, Response, jsonify, render_template, request
 from pathlib import Path
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Tuple
+import csv
+import functools
 import threading
 from datetime import date
-import subprocess
-import sys
-import tempfile
 import unicodedata
+import numpy as np
+import orjson
 import pandas as pd
 from dateutil import parser as date_parser
 
-# 正規化済み台帳ファイルや変換スクリプトのパスを定義
+from normalize import DEFAULT_HEADERS, iter_entries, resolve_ledger_type
+
+# pyarrow があれば検索インデックスを Arrow 文字列で保持し C 実装の部分一致を使う
+try:
+	import pyarrow  # noqa: F401
+	_HAS_PYARROW = True
+except ImportError:
+	_HAS_PYARROW = False
+_SEARCH_INDEX_DTYPE = "string[pyarrow]" if _HAS_PYARROW else "string"
+
+# 正規化済み台帳ファイルのパスを定義
 DATA_FILE = Path(__file__).parent / "normalized_ledgers.tsv"
+PARQUET_FILE = DATA_FILE.with_suffix(".parquet")
 DATA_DIR = Path(__file__).parent / "data"
-NORMALIZE_SCRIPT = Path(__file__).parent / "normalize.py"
+_LEDGER_SOURCE_ENCODING = "cp932"
 _PURCHASE_LEDGER_FILENAME = "買掛台帳.TXT"
 _SALES_LEDGER_FILENAME = "売掛台帳.TXT"
+# 書き手（再構築・再生成）のみが取得するロック。読み手は _df_cache の参照取得だけで動く
 DATA_LOCK = threading.Lock()
 
 app = Flask(__name__)
@@ -37,9 +50,58 @@ def _infer_date(value: Any) -> Optional[pd.Timestamp]:
 			return None
 
 
+def _parse_date_column(values: pd.Series) -> pd.Series:
+	# カラム全体を一括で datetime64 に変換し、解析できない行のみ dateutil で補う
+	parsed = pd.to_datetime(values, errors="coerce", format="mixed")
+	fallback_mask = parsed.isna() & values.notna()
+	if fallback_mask.any():
+		parsed.loc[fallback_mask] = pd.to_datetime(
+			values.loc[fallback_mask].map(_infer_date), errors="coerce"
+		)
+	return parsed
+
+
 _SEARCH_EXCLUDE_COLUMNS = {"search_index"}
 _SPACE_CHARACTERS = (" ", "\u3000")
 
+# 仕入／売上の既知トークンを正規化後の区分へ対応付ける静的辞書
+_TYPE_MAP: Dict[str, str] = {
+	token: "purchase"
+	for token in [
+		"買掛",
+		"仕入",
+		"Purchase",
+		"purchase",
+		"buy",
+		"supplier_detail",
+		"supplier_balance",
+		"opening_balance",
+	]
+}
+_TYPE_MAP.update(
+	{
+		token: "sale"
+		for token in [
+			"売掛",
+			"販売",
+			"Sales",
+			"sales",
+			"sale",
+			"customer_detail",
+			"customer_balance",
+		]
+	}
+)
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def _normalize_text_for_search(text: str) -> str:
+	# 同じ文字列（相手先名や検索語など）が繰り返し来るため、正規化結果をキャッシュする
+	text = unicodedata.normalize("NFKC", text)
+	for ch in _SPACE_CHARACTERS:
+		text = text.replace(ch, "")
+	return text.upper()
+
 
 def _normalize_for_search(value: Any) -> str:
 	# 検索用に全角・半角や空白を正規化し大文字化する
@@ -49,150 +111,288 @@ def _normalize_for_search(value: Any) -> str:
 	except TypeError:
 		if value is None:
 			return ""
-	text = str(value)
-	text = unicodedata.normalize("NFKC", text)
-	for ch in _SPACE_CHARACTERS:
-		text = text.replace(ch, "")
-	return text.upper()
+	return _normalize_text_for_search(str(value))
 
 
 def _build_search_index(df: pd.DataFrame) -> pd.Series:
 	# 各カラムを検索用に正規化したテキストとして結合する
-	combined = pd.Series("", index=df.index, dtype="object")
+	# セル単位の Python 呼び出しを避け、pandas の文字列カーネルで一括処理する
+	normalized_columns: List[pd.Series] = []
 	for column in df.columns:
 		if column in _SEARCH_EXCLUDE_COLUMNS:
 			continue
-		combined = combined + df[column].map(_normalize_for_search)
-	return combined
+		normalized_columns.append(
+			df[column]
+			.astype("string")
+			.str.normalize("NFKC")
+			.str.replace(" ", "", regex=False)
+			.str.replace("　", "", regex=False)
+			.str.upper()
+			.fillna("")
+		)
+	if not normalized_columns:
+		return pd.Series("", index=df.index, dtype=_SEARCH_INDEX_DTYPE)
+	return normalized_columns[0].str.cat(normalized_columns[1:], sep="").astype(_SEARCH_INDEX_DTYPE)
 
 
-def load_data(force: bool = False) -> pd.DataFrame:
+def _read_source_tsv() -> pd.DataFrame:
+	# pyarrow のマルチスレッド CSV パーサが使える場合はそちらを優先する
+	if _HAS_PYARROW:
+		try:
+			return pd.read_csv(DATA_FILE, sep="\t", dtype=str, keep_default_na=False, engine="pyarrow")
+		except (ValueError, TypeError):
+			pass
+	return pd.read_csv(DATA_FILE, sep="\t", dtype=str, keep_default_na=False)
+
+
+def _read_parquet_cache() -> Optional[pd.DataFrame]:
+	# 正規化済みフレームの Parquet サイドカーが新しければそのまま読み込む
+	if not _HAS_PYARROW:
+		return None
+	if not PARQUET_FILE.exists():
+		return None
+	if PARQUET_FILE.stat().st_mtime < DATA_FILE.stat().st_mtime:
+		return None
+	try:
+		return pd.read_parquet(PARQUET_FILE)
+	except Exception:
+		return None
+
+
+def _write_parquet_cache(frame: pd.DataFrame) -> None:
+	# 次回のコールドスタート用に正規化済みフレームを保存する（失敗しても動作は継続）
+	if not _HAS_PYARROW:
+		return
+	try:
+		frame.to_parquet(PARQUET_FILE)
+	except Exception:
+		PARQUET_FILE.unlink(missing_ok=True)
+
+
+def _build_normalized_frame() -> pd.DataFrame:
 	# TSV を読み込み、検索や絞り込みに使いやすい形に整形する
+	df = _read_source_tsv().replace({"": pd.NA})
+	# 既存のカラムを標準化し、リポジトリ想定のカラム名に揃える
+	standard_names = {
+		"date": ["date", "日付", "伝票日付", "transaction_date"],
+		"type": ["type", "種別", "区分", "ledger_type", "entry_type"],
+		"counterparty": [
+			"counterparty",
+			"相手先",
+			"得意先",
+			"仕入先",
+			"supplier_name",
+			"customer_name",
+		],
+		"item": ["item", "品目", "摘要", "品名", "description"],
+		"amount": ["amount", "金額", "税込金額", "税抜金額"],
+		"quantity": ["quantity", "数量"],
+		"document_id": [
+			"document_id",
+			"伝票番号",
+			"請求番号",
+			"reference_1",
+			"reference_2",
+			"reference_3",
+			"reference_4",
+			"reference_5",
+		],
+		"memo": ["memo", "備考", "メモ", "description_raw", "quantity_note"],
+	}
+	cols: Dict[str, Optional[str]] = {}
+	for canon, candidates in standard_names.items():
+		cols[canon] = next((c for c in candidates if c in df.columns), None)
+	# 不明なカラムを落とさず標準化済みデータフレームを組み立てる
+	normalized = pd.DataFrame()
+	for canon, src in cols.items():
+		if src is not None:
+			normalized[canon] = df[src]
+		else:
+			normalized[canon] = pd.NA
+	# document_id が reference_* に分かれている場合は結合する
+	if "document_id" in normalized.columns and "reference_1" in df.columns:
+		refs = df[[c for c in ["reference_1", "reference_2", "reference_3", "reference_4", "reference_5"] if c in df.columns]]
+		normalized["document_id"] = (
+			normalized["document_id"].fillna("")
+			.where(normalized["document_id"].notna(), "")
+		)
+		if not refs.empty:
+			# 0 行のときは agg(axis=1) が Series にならず where が失敗するため結合をスキップする
+			joined = refs.fillna("").agg(lambda r: "-".join([x for x in r if x]), axis=1)
+			normalized["document_id"] = normalized["document_id"].where(normalized["document_id"].astype(str) != "", joined)
+	# 伝票番号は NA を含まない文字列型で固定し、リクエスト時の fillna/astype を不要にする
+	normalized["document_id"] = normalized["document_id"].fillna("").astype("string")
+
+	# 日付と数値列を解析して型を揃える
+	normalized["date_parsed"] = _parse_date_column(normalized["date"])
+	if "unit_price" not in normalized.columns:
+		normalized["unit_price"] = pd.NA
+	for num_col in ["amount", "quantity", "unit_price"]:
+		normalized[num_col] = pd.to_numeric(normalized[num_col], errors="coerce")
+	# 単価の補完は NumPy 配列上のマスク付き除算で一度に行う（ゼロ除算行は where で除外）
+	# 0 行のとき to_numeric が int64 を返しても除算できるよう float64 を明示する
+	amount_values = normalized["amount"].to_numpy(dtype="float64", na_value=np.nan)
+	quantity_values = normalized["quantity"].to_numpy(dtype="float64", na_value=np.nan)
+	unit_price_values = normalized["unit_price"].to_numpy(dtype="float64", na_value=np.nan, copy=True)
+	compute_mask = (
+		np.isnan(unit_price_values)
+		& ~np.isnan(amount_values)
+		& ~np.isnan(quantity_values)
+		& (quantity_values != 0)
+	)
+	np.divide(amount_values, quantity_values, out=unit_price_values, where=compute_mask)
+	normalized["unit_price"] = unit_price_values
+	# 仕入／売上の区分を静的辞書の一括ルックアップで揃える
+	type_clean = normalized["type"].astype("string").str.strip()
+	normalized["type_norm"] = (
+		type_clean.map(_TYPE_MAP)
+		.fillna(type_clean.str.lower())
+		.replace("", pd.NA)
+		.fillna("unknown")
+	)
+	# 元のカラムも失われないよう統合する
+	for c in df.columns:
+		if c not in normalized.columns:
+			normalized[c] = df[c]
+	if "ledger_type" not in normalized.columns:
+		normalized["ledger_type"] = normalized["type"]
+	else:
+		normalized["ledger_type"] = normalized["ledger_type"].fillna(normalized["type"])
+	ref_cols = [c for c in ["reference_1", "reference_2", "reference_3", "reference_4", "reference_5"] if c in normalized.columns]
+	memo_cols = ref_cols + ([c for c in ["quantity_note"] if c in normalized.columns])
+	if memo_cols:
+		# 行単位の apply を避け、カラム同士の結合で備考をまとめる
+		parts = [normalized[c].fillna("").astype(str).str.strip() for c in memo_cols]
+		combined = parts[0]
+		for part in parts[1:]:
+			combined = combined + np.where(combined.ne("") & part.ne(""), " ", "") + part
+		normalized["memo_combined"] = combined
+	else:
+		normalized["memo_combined"] = ""
+	# 取引行以外のヘッダー行が明示されていれば除外する
+	if "entry_type" in df.columns:
+		non_tx = {"supplier_header", "customer_header"}
+		mask = ~df["entry_type"].isin(non_tx)
+		normalized = normalized[mask]
+	normalized["search_index"] = _build_search_index(normalized)
+	# 相手先や区分などカーディナリティの低い列は category で保持しメモリと比較コストを抑える
+	for low_card_col in ["type_norm", "ledger_type", "counterparty", "unit"]:
+		if low_card_col in normalized.columns:
+			normalized[low_card_col] = normalized[low_card_col].astype("category")
+	# 並び順はリクエスト間で不変なので、ここで一度だけ整列しておく
+	# （boolean mask での絞り込みは相対順序を保つため、リクエスト側の再ソートは不要）
+	normalized = normalized.sort_values(
+		by=["date_parsed", "document_id"],
+		ascending=[False, True],
+		na_position="last",
+		kind="mergesort",
+	).reset_index(drop=True)
+	return normalized
+
+
+def _attach_date_index(frame: pd.DataFrame) -> None:
+	# 日付降順に整列済みのフレームに対し、二分探索用の昇順 int64 配列を付与する
+	# （NaT は末尾に寄せてあるので、有効件数より前だけを対象にする）
+	valid_count = int(frame["date_parsed"].notna().sum())
+	date_values = frame["date_parsed"].to_numpy("datetime64[ns]")[:valid_count]
+	frame.attrs["date_index_neg"] = -date_values.view("int64")
+	frame.attrs["date_valid_count"] = valid_count
+
+
+def _slice_by_date_range(
+	frame: pd.DataFrame,
+	start_ts: Optional[pd.Timestamp],
+	end_ts: Optional[pd.Timestamp],
+) -> pd.DataFrame:
+	# 整列済みフレームでは O(N) の全列比較ではなく searchsorted で範囲を切り出す
+	neg_dates = frame.attrs.get("date_index_neg")
+	valid_count = frame.attrs.get("date_valid_count")
+	if neg_dates is None or valid_count is None:
+		# 整列情報がない場合は従来どおり boolean mask で絞り込む
+		result = frame
+		if start_ts is not None:
+			result = result[result["date_parsed"].ge(start_ts)]
+		if end_ts is not None:
+			result = result[result["date_parsed"].le(end_ts)]
+		return result
+	lo = 0
+	hi = valid_count
+	if end_ts is not None:
+		lo = int(np.searchsorted(neg_dates, -end_ts.value, side="left"))
+	if start_ts is not None:
+		hi = int(np.searchsorted(neg_dates, -start_ts.value, side="right"))
+	return frame.iloc[lo:hi]
+
+
+def _attach_bigram_index(frame: pd.DataFrame) -> None:
+	# search_index の bigram → 行位置の転置インデックスを作り、キーワード検索の
+	# 候補行を線形スキャンせずに絞り込めるようにする
+	postings: Dict[str, List[int]] = {}
+	for position, text in enumerate(frame["search_index"].fillna("")):
+		for j in range(len(text) - 1):
+			bigram = text[j : j + 2]
+			plist = postings.setdefault(bigram, [])
+			if not plist or plist[-1] != position:
+				plist.append(position)
+	frame.attrs["search_bigram_postings"] = {
+		bigram: np.asarray(positions, dtype=np.int32)
+		for bigram, positions in postings.items()
+	}
+
+
+def _bigram_candidate_positions(frame: pd.DataFrame, keyword: str) -> Optional[np.ndarray]:
+	# キーワード中の出現頻度が低い bigram の posting list を交差させ、候補行位置を返す
+	# （インデックスがない／1 文字検索のときは None を返し、従来の全走査にフォールバック）
+	postings = frame.attrs.get("search_bigram_postings")
+	if postings is None or len(keyword) < 2:
+		return None
+	bigrams = {keyword[i : i + 2] for i in range(len(keyword) - 1)}
+	if any(bigram not in postings for bigram in bigrams):
+		# 存在しない bigram を含むキーワードはどの行にも一致しない
+		return np.empty(0, dtype=np.int32)
+	rarest = sorted(bigrams, key=lambda b: len(postings[b]))[:3]
+	candidates = postings[rarest[0]]
+	for bigram in rarest[1:]:
+		if candidates.size == 0:
+			break
+		candidates = np.intersect1d(candidates, postings[bigram], assume_unique=True)
+	return candidates
+
+
+def load_data(force: bool = False) -> pd.DataFrame:
+	# 正規化済みフレームをキャッシュから返し、必要なときだけ構築し直す
+	# 読み手は参照の取得だけで済ませ（CPython ではアトミック）、ロックは再構築時のみ使う
 	global _df_cache
+	cached = _df_cache
+	if cached is not None and not force:
+		return cached
 	with DATA_LOCK:
 		if _df_cache is not None and not force:
 			return _df_cache
 		if not DATA_FILE.exists():
 			raise FileNotFoundError(f"Data file not found: {DATA_FILE}")
-		# UTF-8 などのヘッダー付きTSVを想定して読み込む
-		df = pd.read_csv(DATA_FILE, sep="\t", dtype=str, keep_default_na=False).replace({"": pd.NA})
-		# 既存のカラムを標準化し、リポジトリ想定のカラム名に揃える
-		standard_names = {
-			"date": ["date", "日付", "伝票日付", "transaction_date"],
-			"type": ["type", "種別", "区分", "ledger_type", "entry_type"],
-			"counterparty": [
-				"counterparty",
-				"相手先",
-				"得意先",
-				"仕入先",
-				"supplier_name",
-				"customer_name",
-			],
-			"item": ["item", "品目", "摘要", "品名", "description"],
-			"amount": ["amount", "金額", "税込金額", "税抜金額"],
-			"quantity": ["quantity", "数量"],
-			"document_id": [
-				"document_id",
-				"伝票番号",
-				"請求番号",
-				"reference_1",
-				"reference_2",
-				"reference_3",
-				"reference_4",
-				"reference_5",
-			],
-			"memo": ["memo", "備考", "メモ", "description_raw", "quantity_note"],
-		}
-		cols: Dict[str, Optional[str]] = {}
-		for canon, candidates in standard_names.items():
-			cols[canon] = next((c for c in candidates if c in df.columns), None)
-		# 不明なカラムを落とさず標準化済みデータフレームを組み立てる
-		normalized = pd.DataFrame()
-		for canon, src in cols.items():
-			if src is not None:
-				normalized[canon] = df[src]
-			else:
-				normalized[canon] = pd.NA
-		# document_id が reference_* に分かれている場合は結合する
-		if "document_id" in normalized.columns and "reference_1" in df.columns:
-			refs = df[[c for c in ["reference_1", "reference_2", "reference_3", "reference_4", "reference_5"] if c in df.columns]]
-			normalized["document_id"] = (
-				normalized["document_id"].fillna("")
-				.where(normalized["document_id"].notna(), "")
-			)
-			joined = refs.fillna("").agg(lambda r: "-".join([x for x in r if x]), axis=1)
-			normalized["document_id"] = normalized["document_id"].where(normalized["document_id"].astype(str) != "", joined)
+		# force はソースの再読込を意味するため、mtime 比較に頼らずサイドカーを迂回する
+		normalized = None if force else _read_parquet_cache()
+		if normalized is None:
+			normalized = _build_normalized_frame()
+			_write_parquet_cache(normalized)
+		_attach_date_index(normalized)
+		_attach_bigram_index(normalized)
+		# 完成したフレームへの参照を差し替えるだけなので、読み手が
+		# 中途半端な状態を見ることはない（フレームは以後変更しない）
+		_df_cache = normalized
+	return normalized
 
-		# 日付と数値列を解析して型を揃える
-		normalized["date_parsed"] = normalized["date"].map(_infer_date)
-		if "unit_price" not in normalized.columns:
-			normalized["unit_price"] = pd.NA
-		for num_col in ["amount", "quantity", "unit_price"]:
-			normalized[num_col] = pd.to_numeric(normalized[num_col], errors="coerce")
-		mask_compute = (
-			normalized["unit_price"].isna()
-			& normalized["amount"].notna()
-			& normalized["quantity"].notna()
-			& normalized["quantity"].ne(0)
-		)
-		if mask_compute.any():
-			normalized.loc[mask_compute, "unit_price"] = normalized.loc[mask_compute, "amount"] / normalized.loc[mask_compute, "quantity"]
-		# 仕入／売上の区分を揃えた文字列に変換する
-		def _normalize_type(v: Any) -> str:
-			vs = str(v).strip() if not pd.isna(v) else ""
-			if vs in ["買掛", "仕入", "Purchase", "purchase", "buy", "supplier_detail", "supplier_balance", "opening_balance"]:
-				return "purchase"
-			if vs in ["売掛", "販売", "Sales", "sales", "sale", "customer_detail", "customer_balance"]:
-				return "sale"
-			return vs.lower() or "unknown"
-		normalized["type_norm"] = normalized["type"].map(_normalize_type)
-		# 元のカラムも失われないよう統合する
-		for c in df.columns:
-			if c not in normalized.columns:
-				normalized[c] = df[c]
-		if "ledger_type" not in normalized.columns:
-			normalized["ledger_type"] = normalized["type"]
-		else:
-			normalized["ledger_type"] = normalized["ledger_type"].fillna(normalized["type"])
-		ref_cols = [c for c in ["reference_1", "reference_2", "reference_3", "reference_4", "reference_5"] if c in normalized.columns]
-		memo_cols = ref_cols + ([c for c in ["quantity_note"] if c in normalized.columns])
-		if memo_cols:
-			def _join_refs(row: pd.Series) -> str:
-				values = []
-				for col in memo_cols:
-					val = row.get(col, pd.NA)
-					if pd.isna(val):
-						continue
-					text = str(val).strip()
-					if text:
-						values.append(text)
-				return " ".join(values)
-			normalized["memo_combined"] = normalized.apply(_join_refs, axis=1)
-		else:
-			normalized["memo_combined"] = ""
-		# 取引行以外のヘッダー行が明示されていれば除外する
-		if "entry_type" in df.columns:
-			non_tx = {"supplier_header", "customer_header"}
-			mask = ~df["entry_type"].isin(non_tx)
-			normalized = normalized[mask]
-		normalized["search_index"] = _build_search_index(normalized)
-	_df_cache = normalized
-	return _df_cache
-
-
-def _run_normalize_script(src: Path, dest: Path) -> None:
-	# 個別台帳を正規化スクリプトで TSV に変換する
-	cmd = [sys.executable, str(NORMALIZE_SCRIPT), str(src), "--output", str(dest)]
-	proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-	if proc.returncode != 0:
-		stdout_text = proc.stdout.decode("utf-8", errors="ignore")
-		stderr_text = proc.stderr.decode("utf-8", errors="ignore")
-		message = stderr_text or stdout_text or f"exit code {proc.returncode}"
-		raise RuntimeError(f"Failed to normalize {src.name}: {message}")
+
+def _normalize_ledger_entries(src: Path) -> List[Tuple[str, ...]]:
+	# 個別台帳を normalize モジュールでプロセス内変換する（subprocess 起動を避ける）
+	ledger_type = resolve_ledger_type(src, None)
+	with src.open("r", encoding=_LEDGER_SOURCE_ENCODING, errors="ignore") as fh:
+		return list(iter_entries(csv.reader(fh), ledger_type))
 
 
 def _regenerate_normalized_ledgers() -> None:
-	# 元データを一時ディレクトリで正規化し、統合ファイルを更新する
+	# 元データをプロセス内で正規化し、統合ファイルを更新する
 	purchase_path = DATA_DIR / _PURCHASE_LEDGER_FILENAME
 	sales_path = DATA_DIR / _SALES_LEDGER_FILENAME
 	missing: List[str] = []
@@ -202,20 +402,15 @@ def _regenerate_normalized_ledgers() -> None:
 		missing.append(str(sales_path))
 	if missing:
 		raise FileNotFoundError("Missing ledger sources: " + ", ".join(missing))
-	with tempfile.TemporaryDirectory() as tmpdir:
-		tmpdir_path = Path(tmpdir)
-		purchase_tmp = tmpdir_path / "purchase.tsv"
-		sales_tmp = tmpdir_path / "sales.tsv"
-		_run_normalize_script(purchase_path, purchase_tmp)
-		_run_normalize_script(sales_path, sales_tmp)
-		with purchase_tmp.open("r", encoding="utf-8-sig") as purchase_fh:
-			purchase_content = purchase_fh.read()
-		with sales_tmp.open("r", encoding="utf-8-sig") as sales_fh:
-			sales_lines = sales_fh.readlines()
+	# 正規化は GIL を握る純 Python 処理のためスレッド化しても速くならない。
+	# 両台帳の正規化が成功してから統合ファイルを書き換える
+	purchase_entries = _normalize_ledger_entries(purchase_path)
+	sales_entries = _normalize_ledger_entries(sales_path)
 	with DATA_FILE.open("w", encoding="utf-8-sig", newline="") as out_fh:
-		out_fh.write(purchase_content)
-		if sales_lines:
-			out_fh.writelines(sales_lines[1:])
+		writer = csv.writer(out_fh, delimiter="\t", lineterminator="\n")
+		writer.writerow(DEFAULT_HEADERS)
+		writer.writerows(purchase_entries)
+		writer.writerows(sales_entries)
 
 
 @app.get("/")
@@ -245,32 +440,31 @@ def api_transactions():
 	types = request.args.getlist("type")  # 例: ["sale", "purchase"]
 	keyword = request.args.get("q")
 
-	if start:
-		start_ts = _infer_date(start)
-		if start_ts is not None:
-			query = query[query["date_parsed"].ge(start_ts)]
-	if end:
-		end_ts = _infer_date(end)
-		if end_ts is not None:
-			query = query[query["date_parsed"].le(end_ts)]
+	start_ts = _infer_date(start) if start else None
+	end_ts = _infer_date(end) if end else None
+	if start_ts is not None or end_ts is not None:
+		query = _slice_by_date_range(query, start_ts, end_ts)
 	if types:
 		query = query[query["type_norm"].isin(types)]
 	if keyword:
 		kw_normalized = _normalize_for_search(keyword)
 		if kw_normalized:
-			mask = query["search_index"].str.contains(kw_normalized, na=False)
+			# 転置インデックスで候補行を先に絞り、部分一致の検証はその小さな集合だけに行う
+			candidates = _bigram_candidate_positions(df, kw_normalized)
+			if candidates is not None:
+				query = query[query.index.isin(candidates)]
+			mask = query["search_index"].str.contains(kw_normalized, na=False, regex=False)
 			query = query[mask]
 	doc_id = request.args.get("document_id")
 	doc_date = request.args.get("document_date")
 	if doc_id:
-		query = query[query["document_id"].fillna("").astype(str) == doc_id]
+		query = query[query["document_id"] == doc_id]
 	if doc_date:
 		doc_ts = _infer_date(doc_date)
 		if doc_ts is not None:
 			query = query[query["date_parsed"].eq(doc_ts)]
 
-	# 日付の降順・伝票番号の昇順で並べ替える
-	query = query.sort_values(by=["date_parsed", "document_id"], ascending=[False, True], na_position="last")
+	# キャッシュ時点で日付の降順・伝票番号の昇順に整列済みのため再ソートは行わない
 	# UI が必要とするカラムのみを返却する
 	fields: List[str] = [
 		"date",
@@ -285,10 +479,11 @@ def api_transactions():
 	]
 	base = query[fields].copy()
 	base = base.rename(columns={"memo_combined": "memo"})
-	# 品名と備考を結合した列を作成
-	base["item_memo"] = base.apply(lambda row: 
-		f"{row['item'] if pd.notna(row['item']) and str(row['item']).strip() else ''}<br />{row['memo'] if pd.notna(row['memo']) and str(row['memo']).strip() else ''}".strip("<br />"), 
-		axis=1)
+	# 品名と備考を結合した列をベクトル化した文字列演算で作成
+	item = base["item"].fillna("").astype(str).str.strip()
+	memo = base["memo"].fillna("").astype(str).str.strip()
+	both = item.ne("") & memo.ne("")
+	base["item_memo"] = np.where(both, item + "<br />" + memo, np.where(item.ne(""), item, memo))
 	# amount と payment を合計した total_amount を計算
 	payment_col = "payment" if "payment" in query.columns else None
 	if payment_col:
@@ -300,17 +495,22 @@ def api_transactions():
 		base["total_amount"] = pd.to_numeric(base["amount"], errors="coerce").fillna(0)
 	
 	base["type_norm"] = query["type_norm"]
-	base["date_iso"] = query["date_parsed"].apply(lambda v: v.strftime("%Y-%m-%d") if pd.notna(v) else "")
+	base["date_iso"] = query["date_parsed"].dt.strftime("%Y-%m-%d").fillna("")
+	# category 列は fillna("") できないため、出力前に object へ戻す
+	for column in base.columns:
+		if isinstance(base[column].dtype, pd.CategoricalDtype):
+			base[column] = base[column].astype(object)
 	result = base.fillna("").to_dict(orient="records")
-	return jsonify({
-		"count": len(result),
-		"items": result,
-	})
+	# 大きい結果でも高速にシリアライズできる orjson で直接レスポンスを組み立てる
+	payload = orjson.dumps(
+		{"count": len(result), "items": result},
+		option=orjson.OPT_SERIALIZE_NUMPY,
+	)
+	return Response(payload, mimetype="application/json")
 
 
 @app.post("/api/upload_ledgers")
 def api_upload_ledgers():
-	global _df_cache
 	DATA_DIR.mkdir(exist_ok=True)
 	purchase_file = request.files.get("purchase")
 	sales_file = request.files.get("sales")
@@ -327,7 +527,7 @@ def api_upload_ledgers():
 			saved.append("sales")
 		with DATA_LOCK:
 			_regenerate_normalized_ledgers()
-			_df_cache = None
+		# 旧フレームは新しいフレームが完成するまで参照され続ける（copy-on-write）
 		load_data(force=True)
 	except FileNotFoundError as exc:
 		return jsonify({"error": str(exc)}), 400
@@ -9,9 +9,10 @@ Usage:
 
 import argparse
 import csv
+import re
 import sys
 from pathlib import Path
-from typing import Iterable, List, Optional, Tuple
+from typing import Iterable, Iterator, List, Optional, Tuple
 
 DEFAULT_HEADERS = [
     "ledger_type",
@@ -75,23 +76,34 @@ def sanitize_numeric(value: str) -> str:
 TARGET_MIN_COLUMNS = 18
 
 
+def iter_rows(path: Path, encoding: str) -> Iterator[List[str]]:
+    """Yield raw CSV rows lazily so parsing streams straight into the writer."""
+    with path.open("r", encoding=encoding, errors="ignore") as fh:
+        yield from csv.reader(fh)
+
+
+_PURCHASE_DESCRIPTION_INDICES = (3, 4, 5, 6, 7, 8)
+_SALES_DESCRIPTION_INDICES = (5, 6, 3, 4, 7, 8)
+
+
 def normalize_row(row: List[str]) -> List[str]:
+    # 18 列に満たない行だけ詰め物をする。十分な長さの行はコピーせずそのまま返す
     if len(row) < TARGET_MIN_COLUMNS:
-        row = row + [""] * (TARGET_MIN_COLUMNS - len(row))
-    return list(row)
+        return list(row) + [""] * (TARGET_MIN_COLUMNS - len(row))
+    return row
 
 
 def select_description(row: List[str], ledger_type: str) -> Tuple[str, str, int]:
+    # 呼び出し側で normalize_row 済み（18 列以上）のため境界チェックは不要
     if ledger_type == "買掛":
-        candidate_indices = (3, 4, 5, 6, 7, 8)
+        candidate_indices = _PURCHASE_DESCRIPTION_INDICES
     else:
-        candidate_indices = (5, 6, 3, 4, 7, 8)
+        candidate_indices = _SALES_DESCRIPTION_INDICES
     for idx in candidate_indices:
-        if idx < len(row):
-            original = row[idx]
-            stripped = original.strip()
-            if stripped:
-                return original, stripped, idx
+        original = row[idx]
+        stripped = original.strip()
+        if stripped:
+            return original, stripped, idx
 
     for idx, original in enumerate(row):
         stripped = original.strip()
@@ -101,20 +113,28 @@ def select_description(row: List[str], ledger_type: str) -> Tuple[str, str, int]
     return "", "", -1
 
 
+# 固定トークンはコンパイル済みの選択肢パターンにまとめ、1 行につき 1 回の走査で
+# 出現トークン集合を得る（個別の `in` 判定を繰り返すより速い）
+_HEADER_TOKENS_RE = re.compile("|".join(map(re.escape, ("繰 越 残 高", "残高", "計", "―"))))
+_LABEL_TOKENS_RE = re.compile("|".join(map(re.escape, ("消費税", "繰越", "支払", "計"))))
+_SUMMARY_TOKENS = frozenset(("計", "―", "残高"))
+_PAYMENT_EXCLUDE_TOKENS = frozenset(("計", "繰越"))
+
+
 def classify_entry(row: List[str], desc: str) -> str:
     if not row[0].strip() and desc:
-        if "繰 越 残 高" in desc:
+        hits = frozenset(_HEADER_TOKENS_RE.findall(desc))
+        if "繰 越 残 高" in hits:
             return "opening_balance"
-        if "計" in desc or "―" in desc:
-            return "summary"
-        if "残高" in desc:
+        if hits & _SUMMARY_TOKENS:
             return "summary"
         return "supplier_header"
 
     label = desc.replace("　", "")
-    if "支払" in label and not ("計" in label or "繰越" in label):
+    hits = frozenset(_LABEL_TOKENS_RE.findall(label))
+    if "支払" in hits and not (hits & _PAYMENT_EXCLUDE_TOKENS):
         return "payment"
-    if "消費税" in label:
+    if "消費税" in hits:
         return "tax"
     return "detail"
 
@@ -138,12 +158,18 @@ def resolve_ledger_type(path: Path, override: Optional[str]) -> str:
     return "買掛"
 
 
+_REFERENCE_INDICES = (3, 4, 5, 6, 7, 8, 9)
+
+
 def iter_entries(rows: Iterable[List[str]], ledger_type: str) -> Iterable[Tuple[str, ...]]:
     supplier_name = ""
     block_index = 0
     line_in_block = 0
+    is_sales = ledger_type == "売掛"
 
     for source_line, raw_row in enumerate(rows, start=1):
+        # normalize_row が 18 列以上を保証するため、以降の添字アクセスに
+        # 行ごとの境界チェックやクロージャ生成は要らない
         row = normalize_row(raw_row)
         description_raw, description, description_index = select_description(row, ledger_type)
 
@@ -159,39 +185,32 @@ def iter_entries(rows: Iterable[List[str]], ledger_type: str) -> Iterable[Tuple[
         else:
             line_in_block += 1
 
-        reference_indices = (3, 4, 5, 6, 7, 8, 9)
         references: List[str] = []
-        for idx in reference_indices:
+        for idx in _REFERENCE_INDICES:
             if idx == description_index:
                 continue
-            references.append(row[idx].strip() if idx < len(row) else "")
+            references.append(row[idx].strip())
             if len(references) == 5:
                 break
         while len(references) < 5:
             references.append("")
 
-        def get(idx: int) -> str:
-            return row[idx] if idx < len(row) else ""
-
-        def numeric(idx: int) -> str:
-            return sanitize_numeric(get(idx))
-
-        if ledger_type == "売掛":
-            quantity = numeric(11)
-            quantity_note = sanitize_numeric(get(9)) or sanitize_numeric(get(10))
-            unit = get(13).strip()
-            tax_rate = numeric(12)
-            unit_price = numeric(14)
-            amount = numeric(15)
-            payment = numeric(16) + numeric(17)
+        if is_sales:
+            quantity = sanitize_numeric(row[11])
+            quantity_note = sanitize_numeric(row[9]) or sanitize_numeric(row[10])
+            unit = row[13].strip()
+            tax_rate = sanitize_numeric(row[12])
+            unit_price = sanitize_numeric(row[14])
+            amount = sanitize_numeric(row[15])
+            payment = sanitize_numeric(row[16]) + sanitize_numeric(row[17])
         else:
-            quantity = numeric(9)
-            quantity_note = sanitize_numeric(get(10))
-            unit = get(11).strip()
-            tax_rate = numeric(12)
-            unit_price = numeric(13)
-            amount = numeric(14)
-            payment = numeric(15)
+            quantity = sanitize_numeric(row[9])
+            quantity_note = sanitize_numeric(row[10])
+            unit = row[11].strip()
+            tax_rate = sanitize_numeric(row[12])
+            unit_price = sanitize_numeric(row[13])
+            amount = sanitize_numeric(row[14])
+            payment = sanitize_numeric(row[15])
 
         output_row = (
             ledger_type,
@@ -222,9 +241,6 @@ def iter_entries(rows: Iterable[List[str]], ledger_type: str) -> Iterable[Tuple[
 def main() -> None:
     args = parse_args()
 
-    with args.input.open("r", encoding=args.encoding, errors="ignore") as fh:
-        rows = list(csv.reader(fh))
-
     ledger_type = resolve_ledger_type(args.input, args.ledger_type)
 
     if args.output:
@@ -238,7 +254,7 @@ def main() -> None:
     try:
         writer = csv.writer(output_handle, delimiter=args.delimiter, lineterminator="\n")
         writer.writerow(DEFAULT_HEADERS)
-        for entry in iter_entries(rows, ledger_type):
+        for entry in iter_entries(iter_rows(args.input, args.encoding), ledger_type):
             writer.writerow(entry)
     finally:
         if should_close: